@@ -3,8 +3,10 @@ from __future__ import print_function
 import errno
 import os
 import platform
+import shutil
 import subprocess
 import sys
+import tempfile
 import unittest
 
 import mock
@@ -25,54 +27,254 @@ def touni(s, enc='utf8', err='strict'):
 
 
 class MockTestenvConfig(object):
-    def __init__(self, basepython):
+    def __init__(self, basepython, envname=None, auto_install=False, always_latest_patch=True,
+                 no_fallback=False, verbose_level=0):
         self.basepython = basepython
+        self.envname = envname or basepython
         self.tox_pyenv_fallback = True
+        self.tox_pyenv_install_auto_install = auto_install
+        self.tox_pyenv_install_auto_install_always_latest_patch = always_latest_patch
+        self.tox_pyenv_install_no_fallback = no_fallback
+        self.config = mock.Mock()
+        self.config.option.verbose_level = verbose_level
 
 
 class TestToxPyenvNoPyenv(unittest.TestCase):
 
     def setUp(self):
-        def _mock_popen_func(cmd, *args, **kw):
-            if all(x in cmd for x in ['which', '*TEST*']):
+        def _mock_run_func(cmd, *args, **kw):
+            if all(x in cmd for x in ['*TEST*', 'root']):
                 raise OSError(errno.ENOENT, 'No such file or directory')
-            self.fail('Unexpected call to Popen')
-            # return self.popen_patcher.temp_original(*args, **kw)
-        self.popen_patcher = mock.patch.object(
-            tox_pyenv_install.subprocess, 'Popen', autospec=True,
-            side_effect=_mock_popen_func,
+            self.fail('Unexpected call to run')
+            # return self.run_patcher.temp_original(*args, **kw)
+        self.run_patcher = mock.patch.object(
+            tox_pyenv_install.subprocess, 'run', autospec=True,
+            side_effect=_mock_run_func,
         )
-        self.popen_patcher.start()
+        self.run_patcher.start()
         self.warning_patcher = mock.patch.object(
             tox_pyenv_install.LOG, 'warning', autospec=True,
         )
         self.warning_patcher.start()
+        # no PYENV_ROOT and no cached pyenv lookups, so `pyenv root` has to be run
+        self.environ_patcher = mock.patch.dict(os.environ)
+        self.environ_patcher.start()
+        os.environ.pop('PYENV_ROOT', None)
+        tox_pyenv_install.PyEnv.clear_caches()
+        tox_pyenv_install.PyEnv._pyenv_executable = '*TEST*'
 
     def tearDown(self):
-        self.popen_patcher.stop()
+        self.run_patcher.stop()
         self.warning_patcher.stop()
+        self.environ_patcher.stop()
+        tox_pyenv_install.PyEnv.clear_caches()
 
     def test_logs_if_no_pyenv_binary(self):
         mock_test_env_config = MockTestenvConfig('*TEST*')
         tox_pyenv_install.tox_get_python_executable(mock_test_env_config)
-        expected_popen = [
+        expected_run = [
             mock.call(
-                [mock.ANY, 'which', '*TEST*'],
+                ['*TEST*', 'root'],
                 stderr=-1, stdout=-1,
-                universal_newlines=True
+                universal_newlines=True,
+                check=False
             )
         ]
         self.assertEqual(
-            tox_pyenv_install.subprocess.Popen.call_args_list,
-            expected_popen
+            tox_pyenv_install.subprocess.run.call_args_list,
+            expected_run
         )
         expected_warn = [
-            mock.call("pyenv doesn't seem to be installed, you "
-                      "probably don't want this plugin installed either.")
+            mock.call("pyenv doesn't seem to be able to get "
+                      "root directory; STDERR: %s", None)
         ]
         self.assertEqual(tox_pyenv_install.LOG.warning.call_args_list, expected_warn)
 
 
+class TestPyVersion(unittest.TestCase):
+
+    def test_any_version_tuple(self):
+        cpython = tox_pyenv_install.PyImplementation.CPython
+        other = tox_pyenv_install.PyImplementation.Other
+        level = tox_pyenv_install.PyVersionDetailLevel
+        expected = {
+            'py35': ((cpython, 3, 5), level.MINOR),
+            'python310': ((cpython, 3, 10), level.MINOR),
+            '3.10': ((cpython, 3, 10), level.MINOR),
+            '3.5.9': ((cpython, 3, 5, 9), level.PATCH),
+            '3.11-dev': ((cpython, 3, 11, 'dev'), level.MINOR),
+            'anaconda3-5.3.1': ((other, 5, 3, 1), level.PATCH),
+            'mambaforge-pypy3': (None, None),
+            'pyenv': (None, None),
+        }
+        for version_string, version_tuple in expected.items():
+            self.assertEqual(tox_pyenv_install.PyVersion.get_any_version_tuple(version_string), version_tuple)
+
+
+class TestPyEnvCaches(unittest.TestCase):
+
+    def setUp(self):
+        install_list_proc = mock.Mock(returncode=0)
+        self.run_pyenv_patcher = mock.patch.object(
+            tox_pyenv_install.PyEnv, 'run_pyenv',
+            return_value=(install_list_proc,
+                          'Available versions:\n  3.5.9\n  3.5.10\n  3.11-dev\n',
+                          '', ['pyenv', 'install', '-l']),
+        )
+        self.run_pyenv = self.run_pyenv_patcher.start()
+        self.addCleanup(self.run_pyenv_patcher.stop)
+        tox_pyenv_install.PyEnv.clear_caches()
+        self.addCleanup(tox_pyenv_install.PyEnv.clear_caches)
+
+    def test_install_list_runs_once(self):
+        pyenv = tox_pyenv_install.PyEnv
+        self.assertEqual(pyenv.get_installable_pyenv_version_strings(), ['3.5.9', '3.5.10', '3.11-dev'])
+        self.assertIn('3.5.10', pyenv.get_installable_pyenv_pyversions_name_dict())
+        self.assertIn('3.11.dev', pyenv.get_installable_pyenv_pyversions_version_string_dict())
+        self.assertIn((tox_pyenv_install.PyImplementation.CPython, 3, 5, 9),
+                      pyenv.get_installable_pyenv_pyversions_version_tuple_dict())
+        self.assertEqual(self.run_pyenv.call_count, 1)
+
+
+class TestLatestPatchVersion(unittest.TestCase):
+
+    def setUp(self):
+        installable = ['3.10.0', '3.10.12', '3.10-dev', '3.10.2', '3.11-dev',
+                       'anaconda3-5.3.1', 'miniconda3-5.3.1']
+        tox_pyenv_install.PyEnv.clear_caches()
+        self.addCleanup(tox_pyenv_install.PyEnv.clear_caches)
+        tox_pyenv_install.PyEnv._installable_cache = installable
+
+    def find_latest(self, pyversion):
+        latest = tox_pyenv_install.PyEnv.find_latest_installable_patch_version(pyversion)
+        return latest and latest.name
+
+    def test_latest_patch_ranks_numerically(self):
+        self.assertEqual(self.find_latest(tox_pyenv_install.PyVersion('py310', 'py310')), '3.10.12')
+        self.assertEqual(self.find_latest(tox_pyenv_install.PyVersion('3.10', '3.10')), '3.10.12')
+
+    def test_dev_versions(self):
+        # a dev version ranks below released patches but is used if it is the only candidate
+        self.assertEqual(self.find_latest(tox_pyenv_install.PyVersion('3.11', '3.11')), '3.11-dev')
+        self.assertEqual(self.find_latest(tox_pyenv_install.PyVersion('3.11-dev', '3.11-dev')), '3.11-dev')
+        self.assertIsNone(self.find_latest(tox_pyenv_install.PyVersion('3.12', '3.12')))
+
+    def test_ties_keep_listing_order(self):
+        other_5_3 = tox_pyenv_install.PyVersion('5.3', (tox_pyenv_install.PyImplementation.Other, 5, 3))
+        self.assertEqual(self.find_latest(other_5_3), 'anaconda3-5.3.1')
+
+    def test_short_version_tuple_falls_back_to_full_list(self):
+        cpython_3 = tox_pyenv_install.PyVersion('3', (tox_pyenv_install.PyImplementation.CPython, 3))
+        self.assertEqual(self.find_latest(cpython_3), '3.11-dev')
+
+
+class PyenvRootTestCase(unittest.TestCase):
+    """Runs against a temporary PYENV_ROOT with fresh PyEnv caches."""
+
+    installed = {'3.5.9': 'python3', '2.7.18': 'python', 'mambaforge-pypy3': 'python3'}
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        for name, executable in self.installed.items():
+            bin_path = os.path.join(self.root, 'versions', name, 'bin')
+            os.makedirs(bin_path)
+            open(os.path.join(bin_path, executable), 'w').close()
+        environ_patcher = mock.patch.dict(os.environ, {'PYENV_ROOT': self.root})
+        environ_patcher.start()
+        self.addCleanup(environ_patcher.stop)
+        tox_pyenv_install.PyEnv.clear_caches()
+        self.addCleanup(tox_pyenv_install.PyEnv.clear_caches)
+        self.run_pyenv_patcher = mock.patch.object(
+            tox_pyenv_install.PyEnv, 'run_pyenv', side_effect=AssertionError('Unexpected call to run_pyenv'),
+        )
+        self.run_pyenv = self.run_pyenv_patcher.start()
+        self.addCleanup(self.run_pyenv_patcher.stop)
+
+    def executable(self, name):
+        return os.path.join(self.root, 'versions', name, 'bin', self.installed[name])
+
+
+class TestPyenvRoot(PyenvRootTestCase):
+
+    def test_root_from_environment(self):
+        pyenv = tox_pyenv_install.PyEnv
+        self.assertEqual(pyenv.get_pyenv_root_path(), self.root)
+        installed = pyenv.get_installed_pyversions_name_dict()
+        self.assertEqual(sorted(installed), ['2.7.18', '3.5.9', 'mambaforge-pypy3'])
+        self.assertEqual(installed['2.7.18'].executable, self.executable('2.7.18'))
+        self.assertEqual(self.run_pyenv.call_count, 0)
+
+    def test_missing_root_from_environment(self):
+        os.environ['PYENV_ROOT'] = os.path.join(self.root, 'missing')
+        with self.assertRaises(tox_pyenv_install.PyEnvRootPathFailed):
+            tox_pyenv_install.PyEnv.get_pyenv_root_path()
+
+
+class TestToxGetPythonExecutable(PyenvRootTestCase):
+
+    def test_installed_unparseable_name(self):
+        envconfig = MockTestenvConfig('mambaforge-pypy3', verbose_level=1)
+        with self.assertLogs(tox_pyenv_install.LOG, 'INFO') as logs:
+            executable = tox_pyenv_install.tox_get_python_executable(envconfig)
+        self.assertEqual(executable, self.executable('mambaforge-pypy3'))
+        self.assertIn("name='mambaforge-pypy3'", logs.output[0])
+        self.assertIn("version_detail_level=None", logs.output[0])
+
+    def test_installed_latest_patch(self):
+        envconfig = MockTestenvConfig('py35')
+        self.assertEqual(tox_pyenv_install.tox_get_python_executable(envconfig), self.executable('3.5.9'))
+
+
+class TestInstallableListing(PyenvRootTestCase):
+
+    def setUp(self):
+        super(TestInstallableListing, self).setUp()
+        list_patcher = mock.patch.object(
+            tox_pyenv_install.PyEnv, '_list_installable_pyenv_version_strings', return_value=['3.5.9', '3.5.10'],
+        )
+        self.list_installable = list_patcher.start()
+        self.addCleanup(list_patcher.stop)
+
+    def test_installed_version_does_not_list_installable(self):
+        for envname, installed_name in (('3.5.9', '3.5.9'), ('python3.5.9', '3.5.9')):
+            envconfig = MockTestenvConfig(envname, auto_install=True)
+            self.assertEqual(tox_pyenv_install.tox_get_python_executable(envconfig), self.executable(installed_name))
+        self.assertEqual(self.list_installable.call_count, 0)
+
+    def test_missing_version_lists_installable_once(self):
+        envconfig = MockTestenvConfig('py35', auto_install=True)
+        with mock.patch.object(tox_pyenv_install.PyEnv, 'install_using_pyenv', return_value=False):
+            self.assertIsNone(tox_pyenv_install.tox_get_python_executable(envconfig))
+        self.assertEqual(self.list_installable.call_count, 1)
+
+
+class TestResolveExecutableCache(PyenvRootTestCase):
+
+    def reset_installed_cache(self):
+        tox_pyenv_install.PyEnv.invalidate_installed_cache()
+
+    def test_repeated_call_is_cached(self):
+        envconfig = MockTestenvConfig('py35')
+        executable = tox_pyenv_install.tox_get_python_executable(envconfig)
+        self.reset_installed_cache()
+        with mock.patch.object(tox_pyenv_install.os, 'scandir', side_effect=AssertionError('Unexpected scandir')):
+            self.assertEqual(tox_pyenv_install.tox_get_python_executable(envconfig), executable)
+        self.assertEqual(self.run_pyenv.call_count, 0)
+
+    def test_exceptions_are_not_cached(self):
+        envconfig = MockTestenvConfig('py39', no_fallback=True)
+        with mock.patch.object(tox_pyenv_install.LOG, 'error'):
+            with self.assertRaises(tox_pyenv_install.PyEnvPluginFailed):
+                tox_pyenv_install.tox_get_python_executable(envconfig)
+        bin_path = os.path.join(self.root, 'versions', '3.9.18', 'bin')
+        os.makedirs(bin_path)
+        open(os.path.join(bin_path, 'python3'), 'w').close()
+        self.reset_installed_cache()
+        self.assertEqual(tox_pyenv_install.tox_get_python_executable(envconfig),
+                         os.path.join(bin_path, 'python3'))
+
+
 class TestThings(unittest.TestCase):
 
     def test_the_answer(self):
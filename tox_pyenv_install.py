@@ -27,20 +27,28 @@ __license__ = 'Apache License, Version 2.0'
 
 import logging
 import os
-import py
 import re
 import subprocess
 from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
+from shutil import which
 from sys import stdout
 from tox import hookimpl as tox_hookimpl
 
 LOG = logging.getLogger(__name__)
 LOG.setLevel(logging.WARNING)
-handler = logging.StreamHandler(stdout)
-handler.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s %(levelname)-8s %(name)-12s %(message)s')
-handler.setFormatter(formatter)
-LOG.addHandler(handler)
+
+
+def _setup_log_handler():
+    """Attach the stdout handler to LOG once, not at import time and not again on re-import."""
+    if LOG.handlers:
+        return
+    handler = logging.StreamHandler(stdout)
+    handler.setLevel(logging.DEBUG)
+    formatter = logging.Formatter('%(asctime)s %(levelname)-8s %(name)-12s %(message)s')
+    handler.setFormatter(formatter)
+    LOG.addHandler(handler)
 
 
 class ToxPyenvException(Exception):
@@ -91,10 +99,18 @@ class PyImplementation(Enum):
 
 
 class PyVersion:
-    patch_py_version_re = re.compile(r'^(.*?)(\d+)\.(\d+)\.(\d+)$')  # groups: implementation, major, minor, patch
-    minor_py_version_re = re.compile(r'^(.*?)(\d+?)\.(\d+)$')  # groups: implementation, major, minor
-    alt_py_version_re = re.compile(r'^(.*?)(\d+?)\.(\d+)[-_\.](.+?)$')  # groups: implementation, major, minor
-    tox_py_version_re = re.compile(r'^(?:py|python)(\d)(\d+)$')  # groups: major, minor
+    # version string formats, tried in this order, the matched branch is found by match.lastgroup:
+    #   tox:   py35, python310         groups: major, minor
+    #   patch: 3.5.9, anaconda3-5.3.1  groups: implementation, major, minor, patch
+    #   minor: 3.10                    groups: implementation, major, minor
+    #   alt:   3.11-dev                groups: implementation, major, minor, rest
+    # applied with fullmatch, so it carries no ^/$ anchors
+    any_py_version_re = re.compile(
+        r'(?P<tox>(?:py|python)(?P<tox_major>\d)(?P<tox_minor>\d+))'
+        r'|(?P<patch>(?P<patch_impl>.*?)(?P<patch_major>\d+)\.(?P<patch_minor>\d+)\.(?P<patch_patch>\d+))'
+        r'|(?P<minor>(?P<minor_impl>.*?)(?P<minor_major>\d+?)\.(?P<minor_minor>\d+))'
+        r'|(?P<alt>(?P<alt_impl>.*?)(?P<alt_major>\d+?)\.(?P<alt_minor>\d+)[-_\.](?P<alt_rest>.+?))'
+    )
 
     def __init__(self, name, version_string_or_tuple, executable=None, needs_version=True):
         self.name = name
@@ -111,6 +127,8 @@ class PyVersion:
             self.version_tuple = version_string_or_tuple
             self.version_detail_level = PyVersionDetailLevel(len(version_string_or_tuple))
             self.version_string = self.make_version_string(self.version_tuple)
+        # sort key for ranking versions, computed once as version_tuple never changes
+        self.int_version_tuple = PyVersion.ensure_int_version_tuple(self.version_tuple) if self.version_tuple else ()
         # always just store executable path (if given)
         self.executable = executable
 
@@ -125,7 +143,8 @@ class PyVersion:
                "version_detail_level=%s, " \
                "executable='%s'" \
                "]" % \
-               (self.name, self.version_string, self.version_tuple, self.version_detail_level.name, self.executable)
+               (self.name, self.version_string, self.version_tuple,
+                self.version_detail_level.name if self.version_detail_level else None, self.executable)
 
     @classmethod
     def get_implementation(cls, implementation_string):
@@ -133,56 +152,43 @@ class PyVersion:
             if not implementation_string or len(implementation_string.strip()) == 0 \
             else PyImplementation.Other
 
-    @classmethod
-    def get_tox_version_tuple(cls, version_string):
-        match = cls.tox_py_version_re.match(version_string)
-        if match:
-            return PyImplementation.CPython, int(match.group(1)), int(match.group(2))
-        return None
-
-    @classmethod
-    def get_patch_version_tuple(cls, version_string):
-        match = cls.patch_py_version_re.match(version_string)
-        if match:
-            return cls.get_implementation(match.group(1)), int(match.group(2)), int(match.group(3)), int(match.group(4))
-        return None
-
-    @classmethod
-    def get_minor_version_tuple(cls, version_string):
-        match = cls.minor_py_version_re.match(version_string)
-        if match:
-            return cls.get_implementation(match.group(1)), int(match.group(2)), int(match.group(3))
-        return None
-
-    @classmethod
-    def get_alt_version_tuple(cls, version_string):
-        match = cls.alt_py_version_re.match(version_string)
-        if match:
-            return cls.get_implementation(match.group(1)), int(match.group(2)), int(match.group(3)), match.group(4)
-        return None
-
-    @classmethod
-    def get_any_version_tuple(cls, version_string):
-        match = cls.get_tox_version_tuple(version_string)
-        if match:
-            return match, PyVersionDetailLevel.MINOR
-
-        match = cls.get_patch_version_tuple(version_string)
-        if match:
-            return match, PyVersionDetailLevel.PATCH
-
-        match = cls.get_minor_version_tuple(version_string)
-        if match:
-            return match, PyVersionDetailLevel.MINOR
-
-        match = cls.get_alt_version_tuple(version_string)
-        if match:
-            return match, PyVersionDetailLevel.MINOR
-
-        return None, None
+    # parsing only depends on the version string and is memoized,
+    # since the same strings get parsed again while searching and matching versions
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def get_any_version_tuple(version_string):
+        # without a dot only the tox format can match
+        if '.' not in version_string and not version_string.startswith('py'):
+            return None, None
+
+        match = PyVersion.any_py_version_re.fullmatch(version_string)
+        if not match:
+            return None, None
+
+        branch = match.lastgroup
+        if branch == 'tox':
+            return (PyImplementation.CPython, int(match.group('tox_major')), int(match.group('tox_minor'))), \
+                PyVersionDetailLevel.MINOR
+        if branch == 'patch':
+            return (PyVersion.get_implementation(match.group('patch_impl')), int(match.group('patch_major')),
+                    int(match.group('patch_minor')), int(match.group('patch_patch'))), \
+                PyVersionDetailLevel.PATCH
+        if branch == 'minor':
+            return (PyVersion.get_implementation(match.group('minor_impl')), int(match.group('minor_major')),
+                    int(match.group('minor_minor'))), \
+                PyVersionDetailLevel.MINOR
+        return (PyVersion.get_implementation(match.group('alt_impl')), int(match.group('alt_major')),
+                int(match.group('alt_minor')), match.group('alt_rest')), \
+            PyVersionDetailLevel.MINOR
 
     @classmethod
     def make_version_string(cls, version_tuple):
+        # version tuples are (implementation, major, minor[, patch]) almost always, format those directly
+        length = len(version_tuple)
+        if length == 3:
+            return '%s.%s' % (version_tuple[1], version_tuple[2])
+        if length == 4:
+            return '%s.%s.%s' % (version_tuple[1], version_tuple[2], version_tuple[3])
         return '.'.join([str(part) for part in version_tuple[1:]])
 
     @classmethod
@@ -197,26 +203,26 @@ class PyVersion:
 
 
 class PyEnv:
+    # resolved once per process, see find_pyenv_executable
+    _pyenv_executable = None
+    # `pyenv install -l` output and its derived lookups, see get_installable_pyenv_version_strings
+    _installable_cache = None
+    _installable_pyversions = None
+    _installable_indexes = None
+    # installed versions, reset after `pyenv install`, see get_installed_pyversions
+    _installed_pyversions = None
+    _installed_indexes = None
+    # `pyenv root` does not change during a tox run, see get_pyenv_root_path
+    _pyenv_root_path = None
+    # executables searched for in the bin folder of an installed version, in order of preference
+    _python_executable_names = ('python3', 'python')
+
     @classmethod
     def find_pyenv_executable(cls):
-        err = None
-        try:
-            # pylint: disable=no-member
-            pyenv = (getattr(py.path.local.sysfind('pyenv'), 'strpath', 'pyenv')
-                     or 'pyenv')
-            cmd = ['where' if os.name == 'nt' else 'which', pyenv]
-            pipe = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-            out, err = pipe.communicate()
-            if pipe and pipe.poll() == 0:
-                return out.strip()
-        except OSError:
-            LOG.warning("pyenv missing" + "; STDERR: %s", err)
-            raise PyenvMissing(("pyenv missing" + "; STDERR: %s") % err)
+        if not cls._pyenv_executable:
+            # fall back to the bare name, running it raises an OSError that run_pyenv turns into a plugin error
+            cls._pyenv_executable = which('pyenv') or 'pyenv'
+        return cls._pyenv_executable
 
     @classmethod
     def run_pyenv(cls, commands, err_string_on_os_error, log_string_on_os_error, exception_type):
@@ -225,42 +231,43 @@ class PyEnv:
             # pylint: disable=no-member
             pyenv = cls.find_pyenv_executable()
             cmd = [pyenv, *commands]
-            pipe = subprocess.Popen(
+            proc = subprocess.run(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                universal_newlines=True
+                universal_newlines=True,
+                check=False
             )
-            out, err = pipe.communicate()
         except OSError:
             LOG.warning(log_string_on_os_error + "; STDERR: %s", err)
             raise exception_type((err_string_on_os_error + "; STDERR: %s") % err)
         else:
-            return pipe, out, err, cmd
+            return proc, proc.stdout, proc.stderr, cmd
 
     @classmethod
     def find_using_pyenv(cls, pyversion):
-        pipe, out, err, cmd = cls.run_pyenv(
+        proc, out, err, cmd = cls.run_pyenv(
             ['which', pyversion],
             '\'pyenv\': command not found',
             "pyenv doesn't seem to be installed, you probably "
             "don't want this plugin installed either.",
             PyenvWhichFailed
         )
-        if pipe and pipe.poll() == 0:
+        if proc.returncode == 0:
             return out.strip()
         return None  # no error as not found but pyenv worked
 
     @classmethod
     def install_using_pyenv(cls, pyversion):
-        pipe, out, err, cmd = cls.run_pyenv(
+        proc, out, err, cmd = cls.run_pyenv(
             ['install', pyversion.name],
             'install failed',
             "pyenv doesn't seem to be able to install "
             "the requested python version_string " + pyversion.version_string + ".",
             PyenvInstallFailed
         )
-        if pipe and pipe.poll() == 0:
+        if proc.returncode == 0:
+            cls.invalidate_installed_cache()
             return True
         # no error as not installable but fallthrough might be needed
         # raise PyenvInstallFailed("Can't install version '%s' (%s) using pyenv! STDERR: %s",
@@ -270,37 +277,75 @@ class PyEnv:
 
     @classmethod
     def get_installable_pyenv_version_strings(cls):
-        pipe, out, err, cmd = cls.run_pyenv(
+        if cls._installable_cache is None:
+            cls._installable_cache = cls._list_installable_pyenv_version_strings()
+        return cls._installable_cache
+
+    @classmethod
+    def _list_installable_pyenv_version_strings(cls):
+        proc, out, err, cmd = cls.run_pyenv(
             ['install', '-l'],
             'install -l failed',
             "pyenv doesn't seem to be able to list "
             "available python versions",
             PyEnvListInstallCandidatesFailed
         )
-        if pipe and pipe.poll() == 0:
-            return [line.strip() for line in out.strip().split('\n')][1:]
+        if proc.returncode == 0:
+            # skip the 'Available versions:' header line and any blank lines
+            return [
+                version_string for version_string in (line.strip() for line in out.splitlines()[1:]) if version_string
+            ]
         raise PyEnvListInstallCandidatesFailed("Can't list installed pyenv versions! STDERR: %s" % err)
 
     @classmethod
     def get_installable_pyenv_pyversions(cls):
-        return [
-            PyVersion(version_string, version_string, needs_version=False)
-            for version_string in cls.get_installable_pyenv_version_strings()
-        ]
+        if cls._installable_pyversions is None:
+            cls._installable_pyversions = [
+                PyVersion(version_string, version_string, needs_version=False)
+                for version_string in cls.get_installable_pyenv_version_strings()
+            ]
+        return cls._installable_pyversions
+
+    @classmethod
+    def _build_indexes(cls, pyversions):
+        """
+        Index the given versions by name, version string and version tuple in a single pass.
+        The fourth index groups versions by (implementation, major, minor), latest patch first.
+        """
+        by_name, by_vstr, by_tuple, by_minor = {}, {}, {}, {}
+        for version in pyversions:
+            by_name[version.name] = version
+            if version.version_string:
+                by_vstr[version.version_string] = version
+            if version.version_tuple:
+                by_tuple[version.version_tuple] = version
+                by_minor.setdefault(version.version_tuple[:3], []).append(version)
+        for versions in by_minor.values():
+            # stable sort keeps the listing order for equal versions, like max() would
+            versions.sort(key=attrgetter('int_version_tuple'), reverse=True)
+        return by_name, by_vstr, by_tuple, by_minor
+
+    @classmethod
+    def _build_installable_indexes(cls):
+        if cls._installable_indexes is None:
+            cls._installable_indexes = cls._build_indexes(cls.get_installable_pyenv_pyversions())
+        return cls._installable_indexes
 
     @classmethod
     def get_installable_pyenv_pyversions_name_dict(cls):
-        return {version.name: version for version in cls.get_installable_pyenv_pyversions()}
+        return cls._build_installable_indexes()[0]
 
     @classmethod
     def get_installable_pyenv_pyversions_version_string_dict(cls):
-        return {version.version_string: version for version in cls.get_installable_pyenv_pyversions() if
-                version.version_string}
+        return cls._build_installable_indexes()[1]
 
     @classmethod
     def get_installable_pyenv_pyversions_version_tuple_dict(cls):
-        return {version.version_tuple: version for version in cls.get_installable_pyenv_pyversions() if
-                version.version_tuple}
+        return cls._build_installable_indexes()[2]
+
+    @classmethod
+    def get_installable_pyenv_pyversions_minor_version_dict(cls):
+        return cls._build_installable_indexes()[3]
 
     @classmethod
     def find_installable_pyversion_from_name(cls, name):
@@ -325,65 +370,107 @@ class PyEnv:
 
     @classmethod
     def find_installable_pyversion(cls, pyversion):
-        result = None
-        if pyversion.version_string:
-            result = cls.find_installable_pyversion_from_version_string(pyversion.version_string)
-        if not result and pyversion.version_tuple:
-            result = cls.find_installable_pyversion_from_name(pyversion.version_tuple)
-        if not result:
-            result = cls.find_installed_pyversion_from_name(pyversion.name)
-        return result
+        _, by_vstr, by_tuple, _ = cls._build_installable_indexes()
+        return (
+            by_vstr.get(pyversion.version_string) or
+            by_tuple.get(pyversion.version_tuple) or
+            cls.find_installed_pyversion_from_name(pyversion.name)
+        )
 
     @classmethod
     def get_pyenv_root_path(cls):
-        pipe, out, err, cmd = cls.run_pyenv(
+        if cls._pyenv_root_path:
+            return cls._pyenv_root_path
+        # `pyenv root` just reports PYENV_ROOT when it is set, no need to ask pyenv then
+        path = os.environ.get('PYENV_ROOT')
+        if path:
+            if not os.path.isdir(path):
+                raise PyEnvRootPathFailed("Expected pyenv python root path " + path + " doesn't exist!")
+            cls._pyenv_root_path = path
+            return path
+        proc, out, err, cmd = cls.run_pyenv(
             ['root'],
             'pyenv root failed',
             "pyenv doesn't seem to be able to get "
             "root directory",
             PyEnvRootPathFailed
         )
-        if pipe and pipe.poll() == 0:
+        if proc.returncode == 0:
             path = out.strip()
             if not os.path.isdir(path):
                 raise PyEnvRootPathFailed("Expected pyenv python root path " + path + " doesn't exist!")
+            cls._pyenv_root_path = path
             return path
         raise PyEnvRootPathFailed("Can't find pyenv python root path! STDERR: %s" % err)
 
     @classmethod
     def get_pyenv_version_path(cls):
-        path = cls.get_pyenv_root_path() + '/versions/'
+        path = os.path.join(cls.get_pyenv_root_path(), 'versions')
         if not os.path.isdir(path):
             raise PyEnvListInstalledFailed("Expected pyenv python version path " + path + " doesn't exist!")
         return path
 
     @classmethod
-    def get_installed_version_strings(cls):
-        return (version_string for version_string in os.listdir(cls.get_pyenv_version_path()))
+    def get_installed_version_strings(cls, version_path=None):
+        # scandir reports the entry type from readdir, so non-directories are skipped without extra stat calls
+        # (iterated directly, the context manager form needs python 3.6)
+        for entry in os.scandir(version_path or cls.get_pyenv_version_path()):
+            if entry.is_dir():
+                yield entry.name
 
     @classmethod
     def get_installed_pyversions(cls):
-        return [
-            PyVersion(
-                version_string,
-                version_string,
-                cls.find_executable_for_installed_pyenv_version_name(version_string),
-                needs_version=False,
-            )
-            for version_string in cls.get_installed_version_strings()
-        ]
+        if cls._installed_pyversions is None:
+            version_path = cls.get_pyenv_version_path()
+            cls._installed_pyversions = [
+                PyVersion(
+                    version_string,
+                    version_string,
+                    cls.find_executable_for_installed_pyenv_version_name(version_string, version_path),
+                    needs_version=False,
+                )
+                for version_string in cls.get_installed_version_strings(version_path)
+            ]
+        return cls._installed_pyversions
+
+    @classmethod
+    def invalidate_installed_cache(cls):
+        """Forget the installed versions, e.g. after `pyenv install` added one."""
+        cls._installed_pyversions = None
+        cls._installed_indexes = None
+
+    @classmethod
+    def clear_caches(cls):
+        """Forget everything looked up from pyenv, including resolved executables."""
+        cls.invalidate_installed_cache()
+        cls._pyenv_executable = None
+        cls._pyenv_root_path = None
+        cls._installable_cache = None
+        cls._installable_pyversions = None
+        cls._installable_indexes = None
+        _resolve_executable.cache_clear()
+
+    @classmethod
+    def _build_installed_indexes(cls):
+        if cls._installed_indexes is None:
+            cls._installed_indexes = cls._build_indexes(cls.get_installed_pyversions())
+        return cls._installed_indexes
 
     @classmethod
     def get_installed_pyversions_name_dict(cls):
-        return {version.name: version for version in cls.get_installed_pyversions()}
+        return cls._build_installed_indexes()[0]
 
     @classmethod
     def get_installed_pyversions_version_string_dict(cls):
-        return {version.version_string: version for version in cls.get_installed_pyversions() if version.version_string}
+        return cls._build_installed_indexes()[1]
 
     @classmethod
     def get_installed_pyversions_version_tuple_dict(cls):
-        return {version.version_tuple: version for version in cls.get_installed_pyversions() if version.version_tuple}
+        return cls._build_installed_indexes()[2]
+
+    @classmethod
+    def get_installed_pyversions_minor_version_dict(cls):
+        return cls._build_installed_indexes()[3]
 
     @classmethod
     def find_installed_pyversion_from_name(cls, name):
@@ -408,23 +495,21 @@ class PyEnv:
 
     @classmethod
     def find_installed_pyversion(cls, pyversion):
-        result = None
-        if pyversion.version_string:
-            result = cls.find_installed_pyversion_from_version_string(pyversion.version_string)
-        if not result and pyversion.version_tuple:
-            result = cls.find_installed_pyversion_from_version_tuple(pyversion.version_tuple)
-        if not result:
-            result = cls.find_installed_pyversion_from_name(pyversion.name)
-        return result
+        by_name, by_vstr, by_tuple, _ = cls._build_installed_indexes()
+        return (
+            by_vstr.get(pyversion.version_string) or
+            by_tuple.get(pyversion.version_tuple) or
+            by_name.get(pyversion.name)
+        )
 
     @classmethod
-    def find_executable_for_installed_pyenv_version_name(cls, pyenv_version_name):
+    def find_executable_for_installed_pyenv_version_name(cls, pyenv_version_name, version_path=None):
+        bin_path = os.path.join(version_path or cls.get_pyenv_version_path(), pyenv_version_name, 'bin')
         return next(
             (
                 path
                 for path in
-                (cls.get_pyenv_version_path() + pyenv_version_name + '/bin/' + executable for executable in
-                 ['python3', 'python'])
+                (os.path.join(bin_path, executable) for executable in cls._python_executable_names)
                 if os.path.isfile(path)
             ),
             None
@@ -432,76 +517,47 @@ class PyEnv:
 
     @classmethod
     def match_python_version_tuple(cls, version_tuple_less, version_tuple_more):
-        ok = True
-        for i in range(len(version_tuple_less)):
-            if not len(version_tuple_more) > i or version_tuple_less[i] != version_tuple_more[i]:
-                ok = False
-                break
-        return ok
+        """Check whether version_tuple_less is a prefix of version_tuple_more."""
+        return len(version_tuple_more) >= len(version_tuple_less) and \
+            tuple(version_tuple_more[:len(version_tuple_less)]) == tuple(version_tuple_less)
 
     @classmethod
-    def find_latest_installed_patch_version(cls, install_pyversion):
-        candidates = []
-        for pyversion in cls.get_installed_pyversions():
-            if (
-                    (
-                            pyversion.name.startswith(install_pyversion.name) or
-                            (
-                                    pyversion.version_string and install_pyversion.version_string and
-                                    pyversion.version_string.startswith(install_pyversion.version_string)
-                            )
-                    ) and
-                    install_pyversion.version_tuple and
-                    pyversion.version_tuple and
-                    cls.match_python_version_tuple(install_pyversion.version_tuple, pyversion.version_tuple)
-            ):
-                candidates.append(pyversion)
-        if len(candidates) == 0:
+    def _find_latest_patch_version(cls, install_pyversion, minor_version_dict, pyversions):
+        if not install_pyversion.version_tuple:
             return None
-        return max(candidates, key=lambda pyversion: PyVersion.ensure_int_version_tuple(pyversion.version_tuple))
+        if len(install_pyversion.version_tuple) >= 3:
+            candidates = minor_version_dict.get(install_pyversion.version_tuple[:3], ())
+        else:
+            candidates = sorted((pyversion for pyversion in pyversions if pyversion.version_tuple),
+                                key=attrgetter('int_version_tuple'), reverse=True)
+        # candidates are ordered latest first, so the first match is the latest patch version
+        for pyversion in candidates:
+            if cls.match_python_version_tuple(install_pyversion.version_tuple, pyversion.version_tuple):
+                return pyversion
+        return None
+
+    @classmethod
+    def find_latest_installed_patch_version(cls, install_pyversion):
+        return cls._find_latest_patch_version(
+            install_pyversion, cls.get_installed_pyversions_minor_version_dict(), cls.get_installed_pyversions())
 
     @classmethod
     def find_latest_installable_patch_version(cls, install_pyversion):
-        candidates = []
-        for pyversion in cls.get_installable_pyenv_pyversions():
-            if (
-                    (
-                            pyversion.name.startswith(install_pyversion.name) or
-                            (
-                                    pyversion.version_string and install_pyversion.version_string and
-                                    pyversion.version_string.startswith(install_pyversion.version_string)
-                            )
-                    ) and
-                    install_pyversion.version_tuple and
-                    pyversion.version_tuple and
-                    cls.match_python_version_tuple(install_pyversion.version_tuple, pyversion.version_tuple)
-            ):
-                candidates.append(pyversion)
-        if len(candidates) == 0:
-            return None
-        return max(candidates, key=lambda pyversion: PyVersion.ensure_int_version_tuple(pyversion.version_tuple))
+        return cls._find_latest_patch_version(
+            install_pyversion, cls.get_installable_pyenv_pyversions_minor_version_dict(),
+            cls.get_installable_pyenv_pyversions())
 
 
-@tox_hookimpl
-def tox_get_python_executable(envconfig):
-    """Return a python executable for the given environment name, ignoring the base python name.
-    The first plugin/hook which returns an executable path will determine it.
+@lru_cache(maxsize=128)
+def _resolve_executable(envname, auto_install, always_latest_patch, no_fallback):
+    """Find (or install) the python executable for envname using pyenv.
 
-    ``envconfig`` is the testenv configuration which contains
-    per-testenv configuration, notably the ``.envname`` and ``.basepython``
-    setting.
+    Memoized on the env name and the plugin options. As the env name is unique
+    per testenv, this only saves work when tox asks again for the same env.
+    Exceptions are not cached.
+    Returns None to let tox fall back to its own lookup.
     """
 
-    # set LOG level based on verbosity of tox (-v, -vv)
-    try:
-        verbose_level = envconfig.config.option.verbose_level
-        verbose_to_logging_level_map = [logging.WARNING, logging.INFO, logging.DEBUG]
-        logging_level = verbose_to_logging_level_map[verbose_level] \
-            if verbose_level < len(verbose_to_logging_level_map) else verbose_to_logging_level_map[-1]
-        LOG.setLevel(logging_level)
-    except Exception:
-        pass
-
     # case tox version identifier:
     # example: py35             -> (3,5); '3.5          # minor detail level
     #          envname: py35
@@ -518,92 +574,127 @@ def tox_get_python_executable(envconfig):
     #          envname: miniconda3-4.5.12
     #          basepython: python system executable
 
-    try:
-        pyversion = PyVersion(envconfig.envname, envconfig.envname)
-        LOG.debug("Searching for python version %s", pyversion)
-
-        # first try finding installed
-        found_version = PyEnv.find_installed_pyversion(pyversion)
-        if found_version and found_version.executable:  # found installed
-            LOG.info("Found already installed python version %s", found_version)
-            return found_version.executable
-
-        # try installing
-        if envconfig.tox_pyenv_install_auto_install:
-            # try finding exact installable candidate
-            install_pyversion = PyEnv.find_installable_pyversion(pyversion)
-            if install_pyversion:
-                LOG.debug("Found exact installation candidate python version %s", install_pyversion)
+    # fast path: envname is the exact name of an installed pyenv version, no parsing needed
+    installed_pyversion = PyEnv.get_installed_pyversions_name_dict().get(envname)
+    if installed_pyversion and installed_pyversion.executable:
+        LOG.info("Found already installed python version %s", installed_pyversion)
+        return installed_pyversion.executable
+
+    pyversion = PyVersion(envname, envname)
+    LOG.debug("Searching for python version %s", pyversion)
+
+    # first try finding installed
+    found_version = PyEnv.find_installed_pyversion(pyversion)
+    if found_version and found_version.executable:  # found installed
+        LOG.info("Found already installed python version %s", found_version)
+        return found_version.executable
+
+    # try installing
+    if auto_install:
+        # try finding exact installable candidate
+        install_pyversion = PyEnv.find_installable_pyversion(pyversion)
+        if install_pyversion:
+            LOG.debug("Found exact installation candidate python version %s", install_pyversion)
+        else:
+            if pyversion.version_detail_level == PyVersionDetailLevel.MINOR or \
+                    pyversion.version_detail_level == PyVersionDetailLevel.MAJOR:
+                # try finding latest installed patch version for this minor version
+                if not always_latest_patch:
+                    LOG.debug("Searching latest installed python version %s", pyversion)
+                    install_pyversion = PyEnv.find_latest_installed_patch_version(pyversion)
+                    if install_pyversion:
+                        LOG.debug("Found latest installed python version %s", install_pyversion)
+                # install latest patch version
+                if not install_pyversion:
+                    install_pyversion = PyEnv.find_latest_installable_patch_version(pyversion)
+                    if install_pyversion:
+                        LOG.debug("Found latest patch installation candidate python version %s", install_pyversion)
             else:
-                if pyversion.version_detail_level == PyVersionDetailLevel.MINOR or \
-                        pyversion.version_detail_level == PyVersionDetailLevel.MAJOR:
-                    # try finding latest installed patch version for this minor version
-                    if not envconfig.tox_pyenv_install_auto_install_always_latest_patch:
-                        LOG.debug("Searching latest installed python version %s", pyversion)
-                        install_pyversion = PyEnv.find_latest_installed_patch_version(pyversion)
-                        if install_pyversion:
-                            LOG.debug("Found latest installed python version %s", install_pyversion)
-                    # install latest patch version
-                    if not install_pyversion:
-                        install_pyversion = PyEnv.find_latest_installable_patch_version(pyversion)
-                        if install_pyversion:
-                            LOG.debug("Found latest patch installation candidate python version %s", install_pyversion)
-                else:
-                    LOG.debug("Trying installation candidate from search python version %s", install_pyversion)
-                    install_pyversion = pyversion
-
-            if install_pyversion:
-                # check if already installed
-                already_installed_pyversion = PyEnv.find_installed_pyversion(install_pyversion)
-                if already_installed_pyversion and already_installed_pyversion.executable:
-                    # found already installed
-                    LOG.info("Found already installed python version %s", already_installed_pyversion)
-                    return already_installed_pyversion.executable
-
-                # else install
-                LOG.info("Installing python version %s.....", install_pyversion)
-                installed = PyEnv.install_using_pyenv(install_pyversion)
-                if installed:
-                    # try finding newly installed
-                    newly_installed_pyversion = PyEnv.find_installed_pyversion(install_pyversion)
-                    if newly_installed_pyversion and newly_installed_pyversion.executable:
-                        # found newly installed
-                        LOG.info("Found newly installed python version %s", newly_installed_pyversion)
-                        return newly_installed_pyversion.executable
-                    else:
-                        LOG.warning(
-                            "Searching for python version '%s' after installation using pyenv through tox-pyenv plugin failed!",
-                            install_pyversion.version_string
-                        )
-
+                LOG.debug("Trying installation candidate from search python version %s", install_pyversion)
+                install_pyversion = pyversion
+
+        if install_pyversion:
+            # check if already installed
+            already_installed_pyversion = PyEnv.find_installed_pyversion(install_pyversion)
+            if already_installed_pyversion and already_installed_pyversion.executable:
+                # found already installed
+                LOG.info("Found already installed python version %s", already_installed_pyversion)
+                return already_installed_pyversion.executable
+
+            # else install
+            LOG.info("Installing python version %s.....", install_pyversion)
+            installed = PyEnv.install_using_pyenv(install_pyversion)
+            if installed:
+                # try finding newly installed
+                newly_installed_pyversion = PyEnv.find_installed_pyversion(install_pyversion)
+                if newly_installed_pyversion and newly_installed_pyversion.executable:
+                    # found newly installed
+                    LOG.info("Found newly installed python version %s", newly_installed_pyversion)
+                    return newly_installed_pyversion.executable
                 else:
                     LOG.warning(
-                        "Installation of python version '%s' using pyenv through tox-pyenv plugin failed!",
-                        install_pyversion.name
+                        "Searching for python version '%s' after installation using pyenv through tox-pyenv plugin failed!",
+                        install_pyversion.version_string
                     )
+
             else:
                 LOG.warning(
-                    "Found no installation candidate of python version '%s'!",
-                    pyversion.name
+                    "Installation of python version '%s' using pyenv through tox-pyenv plugin failed!",
+                    install_pyversion.name
                 )
         else:
-            # try finding latest installed patch
-            latest_installed_pyversion = PyEnv.find_latest_installed_patch_version(pyversion)
-            if latest_installed_pyversion and latest_installed_pyversion.executable:
-                # found a (latest) patch version for this minor version
-                LOG.info("Found latest already installed python version %s", latest_installed_pyversion)
-                return latest_installed_pyversion.executable
+            LOG.warning(
+                "Found no installation candidate of python version '%s'!",
+                pyversion.name
+            )
+    else:
+        # try finding latest installed patch
+        latest_installed_pyversion = PyEnv.find_latest_installed_patch_version(pyversion)
+        if latest_installed_pyversion and latest_installed_pyversion.executable:
+            # found a (latest) patch version for this minor version
+            LOG.info("Found latest already installed python version %s", latest_installed_pyversion)
+            return latest_installed_pyversion.executable
 
-        LOG.debug("Didn't find or install python version %s", pyversion)
+    LOG.debug("Didn't find or install python version %s", pyversion)
 
-        # cancel if no fallback
-        if envconfig.tox_pyenv_install_no_fallback:
-            raise PyEnvPluginFailed()
+    # cancel if no fallback
+    if no_fallback:
+        raise PyEnvPluginFailed()
+
+    LOG.info("Failed finding or installing using tox-pyenv plugin, falling back. "
+             "To disable this behavior, set "
+             "tox_pyenv_install_fallback=False in your tox.ini or use "
+             " --tox-pyenv-install-no-fallback on the command line.")
+
+
+@tox_hookimpl
+def tox_get_python_executable(envconfig):
+    """Return a python executable for the given environment name, ignoring the base python name.
+    The first plugin/hook which returns an executable path will determine it.
+
+    ``envconfig`` is the testenv configuration which contains
+    per-testenv configuration, notably the ``.envname`` and ``.basepython``
+    setting.
+    """
 
-        LOG.info("Failed finding or installing using tox-pyenv plugin, falling back. "
-                 "To disable this behavior, set "
-                 "tox_pyenv_install_fallback=False in your tox.ini or use "
-                 " --tox-pyenv-install-no-fallback on the command line.")
+    # set LOG level based on verbosity of tox (-v, -vv)
+    try:
+        verbose_level = envconfig.config.option.verbose_level
+        verbose_to_logging_level_map = [logging.WARNING, logging.INFO, logging.DEBUG]
+        logging_level = verbose_to_logging_level_map[verbose_level] \
+            if verbose_level < len(verbose_to_logging_level_map) else verbose_to_logging_level_map[-1]
+        LOG.setLevel(logging_level)
+    except Exception:
+        pass
+    _setup_log_handler()
+
+    try:
+        return _resolve_executable(
+            envconfig.envname,
+            envconfig.tox_pyenv_install_auto_install,
+            envconfig.tox_pyenv_install_auto_install_always_latest_patch,
+            envconfig.tox_pyenv_install_no_fallback,
+        )
     except ToxPyenvException as e:
         # raise and log if no fallback
         if envconfig.tox_pyenv_install_no_fallback: